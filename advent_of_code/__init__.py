@@ -1,3 +1,8 @@
-from advent_of_code import utils
+def __getattr__(name: str):
+    """Resolve the version on first access, rather than on import."""
+    if name == "__version__":
+        from advent_of_code import utils
 
-__version__ = utils.version()
+        globals()["__version__"] = version = utils.version()
+        return version
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
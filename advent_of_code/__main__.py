@@ -0,0 +1,6 @@
+import sys
+
+from advent_of_code import runner
+
+if __name__ == "__main__":
+    sys.exit(runner.main())
@@ -1,8 +1,11 @@
-import re
+import functools
+import mmap
+import os
+from typing import Mapping
 
 import advent_of_code.utils as utils
 
-FIRST_AND_LAST_DIGIT = re.compile(r"(?:(\d).*(\d+)(?!.*\d)|(\d))")
+DIGITS: dict[str, str] = {str(i): str(i) for i in range(10)}
 NUMBER_NAMES: dict[str, str] = {
     j: str(i)
     for i, j in enumerate(
@@ -10,44 +13,167 @@ NUMBER_NAMES: dict[str, str] = {
         start=1,
     )
 }
-FIRST_AND_LAST_DIGIT_EXTENDED = re.compile(
-    r"(?:({d}).*({d}+)(?!.*{d})|({d}))".format(d=rf"\d|{'|'.join(NUMBER_NAMES.keys())}")
-)
 
 
-def maybe_spelt(val: str) -> str:
-    """Convert a value (either a single digit or that digit spelt out) into just a single digit."""
-    return NUMBER_NAMES.get(val, val)
+class WordAutomaton:
+    """Aho-Corasick automaton used to find the earliest word in a line.
 
+    The automaton is built from the keys of a vocabulary and, for each node,
+    stores the longest word that is a suffix of the node so that a match can
+    be resolved to its start position without walking the output links.
+    """
 
-def identity(val: str) -> str:
-    """Return the value as is."""
-    return val
+    def __init__(self, vocabulary: Mapping[str, str]):
+        if not vocabulary or not all(vocabulary):
+            raise ValueError("The vocabulary must contain non-empty words.")
+        self.vocabulary = dict(vocabulary)
+        self.longest = max(map(len, self.vocabulary))
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.output: list[tuple[int, str] | None] = [None]
+        for word, value in self.vocabulary.items():
+            node = 0
+            for char in word:
+                if char not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(None)
+                    self.goto[node][char] = len(self.goto) - 1
+                node = self.goto[node][char]
+            self.output[node] = (len(word), value)
 
+        queue = list(self.goto[0].values())
+        for node in queue:
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                if node and char in self.goto[fallback]:
+                    self.fail[child] = self.goto[fallback][char]
+                if self.output[child] is None:
+                    self.output[child] = self.output[self.fail[child]]
 
-def document_calibration(document: str, use_extended: bool = True) -> int:
-    """Calculate the calibration value of a document."""
-    if use_extended:
-        pattern = FIRST_AND_LAST_DIGIT_EXTENDED
-        num = maybe_spelt
-    else:
-        pattern = FIRST_AND_LAST_DIGIT
-        num = identity
+    def first(self, line: str) -> str | None:
+        """Get the value of the word that starts earliest in the line."""
+        goto, fail, output, longest = self.goto, self.fail, self.output, self.longest
+        node = 0
+        best_start = -1
+        best = None
+        for i, char in enumerate(line):
+            if best is not None and i - longest + 1 >= best_start:
+                break
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if (match := output[node]) is not None:
+                start = i - match[0] + 1
+                if best is None or start < best_start:
+                    best_start, best = start, match[1]
+        return best
+
+    def reversed(self) -> "WordAutomaton":
+        """Get an automaton that matches the reversed words of the vocabulary."""
+        return WordAutomaton({k[::-1]: v for k, v in self.vocabulary.items()})
+
+
+def document_calibration(
+    document: str,
+    use_extended: bool = True,
+    vocabulary: Mapping[str, str] = NUMBER_NAMES,
+) -> int:
+    """Calculate the calibration value of a document.
+
+    Digits are always recognised; when `use_extended` is set, the words in the
+    vocabulary (English number names by default) are also recognised.
+    """
+    forward = WordAutomaton({**DIGITS, **vocabulary} if use_extended else DIGITS)
+    backward = forward.reversed()
 
     def line_calibration(line: str) -> int:
         """Calculate the calibration value of a line."""
-        first, last, any = next(pattern.finditer(line)).groups()
-        if any is not None:
-            return int(num(any) + num(any))
-        return int(num(first) + num(last))
+        first = forward.first(line)
+        if first is None:
+            raise ValueError(f"No digit found in line {line!r}.")
+        return int(first + backward.first(line[::-1]))
 
     return sum(map(line_calibration, document.splitlines()))
 
 
+def chunk_ranges(buffer: mmap.mmap, chunk_size: int) -> list[tuple[int, int]]:
+    """Split a buffer into byte ranges of roughly `chunk_size` that end on a newline."""
+    ranges = []
+    start, size = 0, len(buffer)
+    while start < size:
+        stop = buffer.find(b"\n", min(start + chunk_size, size) - 1)
+        stop = size if stop == -1 else stop + 1
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def _range_calibration(
+    path: str | os.PathLike,
+    byte_range: tuple[int, int],
+    use_extended: bool,
+    vocabulary: Mapping[str, str],
+) -> int:
+    """Calculate the calibration value of a range of bytes in a file."""
+    with open(path, "rb") as fp, mmap.mmap(
+        fp.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        start, stop = byte_range
+        return document_calibration(
+            mm[start:stop].decode(), use_extended=use_extended, vocabulary=vocabulary
+        )
+
+
+def file_calibration(
+    path: str | os.PathLike,
+    use_extended: bool = True,
+    vocabulary: Mapping[str, str] = NUMBER_NAMES,
+    chunk_size: int = 1 << 24,
+    max_workers: int | None = None,
+) -> int:
+    """Calculate the calibration value of a document stored in a file.
+
+    The file is memory-mapped and split into newline-aligned chunks which are
+    calibrated by a pool of processes, so only `chunk_size` bytes per worker
+    are decoded at any one time.
+    """
+    if not os.path.getsize(path):
+        return 0
+    with open(path, "rb") as fp, mmap.mmap(
+        fp.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        ranges = chunk_ranges(mm, chunk_size)
+    calibrate = functools.partial(
+        _range_calibration,
+        path,
+        use_extended=use_extended,
+        vocabulary=dict(vocabulary),
+    )
+    if len(ranges) == 1:
+        return calibrate(ranges[0])
+    import concurrent.futures
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+        return sum(executor.map(calibrate, ranges))
+
+
+def part_one(inputs: str | None = None):  # pragma: no cover
+    with utils.load(1, inputs=inputs) as contents:
+        return document_calibration(contents, use_extended=False)
+
+
+def part_two(inputs: str | None = None):  # pragma: no cover
+    with utils.load(1, inputs=inputs) as contents:
+        return document_calibration(contents)
+
+
 def main():
-    with utils.contents() as contents:
-        utils.print_part_one(document_calibration(contents, use_extended=False))
-        utils.print_part_two(document_calibration(contents))
+    utils.print_part_one(part_one())
+    utils.print_part_two(part_two())
 
 
 if __name__ == "__main__":
@@ -1,58 +1,121 @@
-import math
+from __future__ import annotations
+
 import re
-from typing import Callable, Literal, TypeAlias
-import typing
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Literal,
+    Mapping,
+    NamedTuple,
+    Sequence,
+    TypeAlias,
+)
+
 import advent_of_code.utils as utils
 
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    np = utils.lazy_import("numpy")
+
 ColorNames: TypeAlias = Literal["red", "green", "blue"]
 
-ID_TO_CALLS = re.compile(r"Game (\d+)?: (.*)", re.M)
-COLORS: dict[ColorNames, re.Pattern] = {
-    color: re.compile(rf"(\d+)\s{color}") for color in typing.get_args(ColorNames)
-}
+TOKENS = re.compile(r"Game (\d+):|(\d+)\s(\w+)")
+
+
+class GameTable(NamedTuple):
+    """Columnar storage of the maximum number of balls per color per game."""
+
+    ids: np.ndarray
+    colors: tuple[str, ...]
+    maxes: np.ndarray
+
+    def column(self, color: str) -> np.ndarray:
+        """Get the maximum number of balls of a color for each game."""
+        return self.maxes[:, self.colors.index(color)]
+
+    def bags(self, configs: Sequence[Mapping[str, int]]) -> np.ndarray:
+        """Align bags of balls to the columns of the table."""
+        return np.asarray(
+            [[bag.get(color, 0) for color in self.colors] for bag in configs],
+            dtype=np.int64,
+        ).reshape(len(configs), len(self.colors))
+
+    def feasible(self, configs: Sequence[Mapping[str, int]]) -> np.ndarray:
+        """Get a configs x games boolean matrix of which games each bag allows."""
+        bags = self.bags(configs)
+        result = np.ones((len(configs), len(self.ids)), dtype=bool)
+        for i in range(len(self.colors)):
+            result &= self.maxes[None, :, i] <= bags[:, i, None]
+        return result
 
+    def possible_id_sums(self, configs: Sequence[Mapping[str, int]]) -> np.ndarray:
+        """Get the sum of the IDs of the possible games for each bag."""
+        return self.feasible(configs) @ self.ids
 
-def max_per_game(games: str) -> dict[int, dict[ColorNames, int]]:
+    def powers(self) -> np.ndarray:
+        """Get the power of the minimum set of balls for each game."""
+        return self.maxes.prod(axis=1)
+
+
+def parse_games(games: str) -> GameTable:
+    """Parse the games in a single pass into a table of maxima per color."""
+    ids: list[int] = []
+    colors: dict[str, int] = {}
+    rows: list[int] = []
+    columns: list[int] = []
+    counts: list[int] = []
+    for id, count, color in TOKENS.findall(games):
+        if id:
+            ids.append(int(id))
+            continue
+        rows.append(len(ids) - 1)
+        columns.append(colors.setdefault(color, len(colors)))
+        counts.append(int(count))
+    maxes = np.zeros((len(ids), len(colors)), dtype=np.int64)
+    np.maximum.at(maxes, (rows, columns), counts)
+    return GameTable(np.asarray(ids, dtype=np.int64), tuple(colors), maxes)
+
+
+def max_per_game(games: str) -> dict[int, dict[str, int]]:
     """Calculate the maximum number of balls per color per game."""
-    games_with_ids = ID_TO_CALLS.findall(games)
-    result = {}
-    for id, calls in games_with_ids:
-        result[int(id)] = {
-            color: max(map(int, pattern.findall(calls)))
-            for color, pattern in COLORS.items()
-        }
-    return result
+    table = parse_games(games)
+    return {
+        id: dict(zip(table.colors, maxes))
+        for id, maxes in zip(table.ids.tolist(), table.maxes.tolist())
+    }
 
 
 def possible_games(
-    max_balls: dict[ColorNames, int],
+    max_balls: Mapping[str, int],
 ) -> Callable[[str], tuple[int, ...]]:
     """Get a function used to filter the games and return possible IDs given a dictionary containing the maximum number of balls of each color."""
 
     def filter_games(games: str):
-        return tuple(
-            id
-            for id, maxes in max_per_game(games).items()
-            if all(
-                maxes[color] <= max_balls[color]
-                for color in typing.get_args(ColorNames)
-            )
-        )
+        table = parse_games(games)
+        return tuple(table.ids[table.feasible((max_balls,))[0]].tolist())
 
     return filter_games
 
 
 def sum_of_powers(games: str):
     """Calculate the sum of the powers of each game."""
-    return sum(math.prod(game.values()) for game in max_per_game(games).values())
+    return int(parse_games(games).powers().sum())
+
+
+def part_one(inputs: str | None = None):  # pragma: no cover
+    with utils.load(2, inputs=inputs) as contents:
+        return sum(possible_games({"red": 12, "green": 13, "blue": 14})(contents))
+
+
+def part_two(inputs: str | None = None):  # pragma: no cover
+    with utils.load(2, inputs=inputs) as contents:
+        return sum_of_powers(contents)
 
 
 def main():
-    with utils.contents() as contents:
-        utils.print_part_one(
-            sum(possible_games({"red": 12, "green": 13, "blue": 14})(contents)),
-        )
-        utils.print_part_two(sum_of_powers(contents))
+    utils.print_part_one(part_one())
+    utils.print_part_two(part_two())
 
 
 if __name__ == "__main__":
@@ -1,77 +1,297 @@
+from __future__ import annotations
+
+import bisect
+import collections
+import functools
+import itertools
+import math
 import re
-import numpy as np
-from scipy.ndimage import maximum_filter, label
+from typing import TYPE_CHECKING, Iterable, Iterator, Literal, NamedTuple, TypeAlias
+
 import advent_of_code.utils as utils
 
-SYMBOL = re.compile(r"([^.\d]+)", re.M)
-NUMBER = re.compile(r"([\d]+)", re.M)
-GEAR = re.compile(r"\*", re.M)
+if TYPE_CHECKING:
+    import numpy as np
+    from scipy import ndimage
+else:
+    np = utils.lazy_import("numpy")
+    ndimage = utils.lazy_import("scipy.ndimage")
+
+GEAR = ord("*")
+ROW = ((0, 0, 0), (1, 1, 1), (0, 0, 0))
+NON_SYMBOLS = b".0123456789\r\n"
+NUMBER = re.compile(r"[0-9]+")
+SYMBOL = re.compile(f"[^{re.escape(NON_SYMBOLS.decode())}]")
+
+Backend: TypeAlias = Literal["dense", "sparse"]
+Event: TypeAlias = tuple[Literal["part", "gear"], int]
+
+
+@functools.cache
+def byte_classes() -> tuple[np.ndarray, np.ndarray]:
+    """Get lookup tables of which bytes are digits and which are symbols."""
+    digits = np.zeros(256, dtype=bool)
+    digits[ord("0") : ord("9") + 1] = True
+    symbols = np.ones(256, dtype=bool)
+    symbols[list(NON_SYMBOLS)] = False
+    return digits, symbols
 
 
-def gear_mask(text: np.ndarray) -> np.ndarray:
+def as_grid(text: str | bytes) -> np.ndarray:
+    """Get a read-only 2-D `uint8` view over the bytes of a schematic."""
+    data = text.encode() if isinstance(text, str) else text
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    width = data.find(b"\n")
+    if width == -1:
+        width = len(buffer)
+    rows = (len(buffer) + 1) // (width + 1) if width else 0
+    if (
+        len(buffer) not in (rows * (width + 1), rows * (width + 1) - 1)
+        or (buffer[width :: width + 1] != ord("\n")).any()
+    ):
+        raise ValueError("The rows of the schematic must all have the same width.")
+    return np.lib.stride_tricks.as_strided(
+        buffer, shape=(rows, width), strides=(width + 1, 1), writeable=False
+    )
+
+
+def gear_mask(grid: np.ndarray) -> np.ndarray:
     """Get a boolean mask containing the location of gears."""
-    return np.vectorize(GEAR.match, otypes=(bool,))(text)
+    return grid == GEAR
 
 
-def number_mask(text: np.ndarray) -> np.ndarray:
+def number_mask(grid: np.ndarray) -> np.ndarray:
     """Get a boolean mask containing the position of numbers."""
-    return np.vectorize(NUMBER.match, otypes=(bool,))(text)
+    return byte_classes()[0][grid]
 
 
-def symbol_mask(text: np.ndarray) -> np.ndarray:
+def symbol_mask(grid: np.ndarray) -> np.ndarray:
     """Get a boolean mask containing the position of symbols."""
-    return np.vectorize(SYMBOL.match, otypes=(bool,))(text)
+    return byte_classes()[1][grid]
+
+
+class SchematicIndex(NamedTuple):
+    """Index of which numbers are adjacent to which symbols in a schematic.
+
+    `pairs` holds the unique (symbol, number label) pairs sorted by symbol
+    and `values` maps each number label to its value (label 0 is empty).
+    """
+
+    symbols: np.ndarray
+    kinds: np.ndarray
+    pairs: np.ndarray
+    values: np.ndarray
 
+    def adjacent_counts(self) -> np.ndarray:
+        """Get the number of distinct numbers adjacent to each symbol."""
+        return np.bincount(self.pairs[:, 0], minlength=len(self.symbols))
 
-def get_gear_ratios(text: str) -> tuple[int, ...]:
+    def with_adjacent(self, k: int, kind: bytes | None = None) -> np.ndarray:
+        """Get the values of the numbers next to symbols with exactly `k` numbers.
+
+        The result has one row per matching symbol (in reading order) and `k`
+        columns. If `kind` is given, only symbols of that character are used.
+        """
+        selected = self.adjacent_counts() == k
+        if kind is not None:
+            selected &= self.kinds == ord(kind)
+        if k == 0:
+            return np.empty((int(selected.sum()), 0), dtype=np.int64)
+        labels = self.pairs[selected[self.pairs[:, 0]], 1]
+        return self.values[labels].reshape(-1, k)
+
+
+def number_values(grid: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """Get the value of each labeled number, with the background as 0.
+
+    The digits of a number are contiguous in reading order, so the place value
+    of each digit is found from its rank within its label.
+    """
+    mask = labels > 0
+    ids = labels[mask]
+    digits = grid[mask].astype(np.int64) - ord("0")
+    lengths = np.bincount(ids)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    places = lengths[ids] - (np.arange(len(ids)) - starts[ids]) - 1
+    values = np.zeros(len(lengths) if len(ids) else 1, dtype=np.int64)
+    np.add.at(values, ids, digits * 10**places)
+    return values
+
+
+def index_schematic(grid: np.ndarray) -> SchematicIndex:
+    """Label the numbers of a schematic once and relate them to the symbols."""
+    labels, num_labels = ndimage.label(number_mask(grid), structure=ROW)
+    ys, xs = np.nonzero(symbol_mask(grid))
+    padded = np.pad(labels, 1)
+    neighbours = np.stack(
+        [padded[ys + 1 + dy, xs + 1 + dx] for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+    )
+    symbol_ids = np.broadcast_to(np.arange(len(ys)), neighbours.shape)
+    keys = np.unique(
+        symbol_ids[neighbours > 0].astype(np.int64) * (num_labels + 1)
+        + neighbours[neighbours > 0]
+    )
+    return SchematicIndex(
+        symbols=np.stack((ys, xs), axis=1),
+        kinds=grid[ys, xs],
+        pairs=np.stack(np.divmod(keys, num_labels + 1), axis=1),
+        values=number_values(grid, labels),
+    )
+
+
+def get_gear_ratios(text: str | bytes, backend: Backend = "dense") -> tuple[int, ...]:
     """Get the gear ratios from a string."""
-    lines = text.splitlines()
-    arr = np.asarray(tuple(tuple(line) for line in lines))
-    gears = gear_mask(arr)
-    numbers = number_mask(arr)
-    labeled_numbers, _ = label(numbers, structure=(((0, 0, 0), (1, 1, 1), (0, 0, 0))))
-    number_or_gear_expanded, _ = label((numbers | gears), structure=np.ones((3, 3)))
-    results: list[int] = []
-
-    for gear_x, gear_y in zip(*np.where(gears)):
-        gear_neighbours = (
-            number_or_gear_expanded == number_or_gear_expanded[gear_x][gear_y]
-        )
-        gear_numbers = labeled_numbers * gear_neighbours
-        ids = np.unique(gear_numbers)[1:]
-        if len(ids) != 2:
-            continue
-        results.append(
-            int("".join(arr[labeled_numbers == ids[0]]))
-            * int("".join(arr[labeled_numbers == ids[1]]))
+    if backend == "sparse":
+        schematic = sparse_schematic(text)
+        return tuple(
+            math.prod(schematic.values[i] for i in numbers)
+            for char, numbers in schematic.symbols
+            if char == "*" and len(numbers) == 2
         )
+    index = index_schematic(as_grid(text))
+    return tuple(index.with_adjacent(2, b"*").prod(axis=1).tolist())
 
-    return tuple(results)
 
-
-def get_part_numbers(text: str) -> tuple[int, ...]:
+def get_part_numbers(text: str | bytes, backend: Backend = "dense") -> tuple[int, ...]:
     """Get the part numbers from text."""
-    lines = text.splitlines()
-    arr = np.asarray(tuple(tuple(line) for line in lines))
-    masked = symbol_mask(arr)
-    masked_neighbor = maximum_filter(masked, size=(3, 3), mode="constant")
-    numbers = number_mask(arr)
-    labeled, _ = label(numbers, structure=(((0, 0, 0), (1, 1, 1), (0, 0, 0))))
-    results: list[int] = []
-    for i in range(masked_neighbor.shape[0]):
-        ids = np.unique(masked_neighbor[i, :] * labeled[i, :])[1:]
-        for id in ids:
-            results.append(
-                int("".join((np.asarray(tuple(lines[i]))[labeled[i, :] == id])))
+    if backend == "sparse":
+        schematic = sparse_schematic(text)
+        parts = sorted({i for _, numbers in schematic.symbols for i in numbers})
+        return tuple(schematic.values[i] for i in parts)
+    index = index_schematic(as_grid(text))
+    is_part = np.zeros(len(index.values), dtype=bool)
+    is_part[index.pairs[:, 1]] = True
+    return tuple(index.values[is_part].tolist())
+
+
+class RowTokens(NamedTuple):
+    """The numbers, as (start, end, value), and symbols, as (column, char), in a row."""
+
+    numbers: list[tuple[int, int, int]]
+    symbols: list[tuple[int, str]]
+
+    @property
+    def starts(self) -> list[int]:
+        """Get the start column of each number."""
+        return [start for start, _, _ in self.numbers]
+
+    @property
+    def columns(self) -> list[int]:
+        """Get the column of each symbol."""
+        return [column for column, _ in self.symbols]
+
+
+def tokenize_row(line: str) -> RowTokens:
+    """Find the number spans and symbol positions in a row of a schematic."""
+    return RowTokens(
+        [(m.start(), m.end(), int(m.group())) for m in NUMBER.finditer(line)],
+        [(m.start(), m.group()) for m in SYMBOL.finditer(line)],
+    )
+
+
+def _numbers_around(row: RowTokens, starts: list[int], column: int) -> list[int]:
+    """Get the values of the numbers in a row that touch a column."""
+    values = []
+    for i in reversed(range(bisect.bisect_right(starts, column + 1))):
+        _, end, value = row.numbers[i]
+        if end < column:
+            break
+        values.append(value)
+    return values
+
+
+def _has_symbol_between(columns: list[int], first: int, last: int) -> bool:
+    """Check whether any of the sorted columns is within [first, last]."""
+    i = bisect.bisect_left(columns, first)
+    return i < len(columns) and columns[i] <= last
+
+
+def stream_schematic(lines: Iterable[str]) -> Iterator[Event]:
+    """Report the part numbers and gear ratios of a schematic row by row.
+
+    Only a window of three tokenized rows is kept, so memory depends on the
+    width of the schematic rather than the number of rows. Events are yielded
+    as `("part", value)` or `("gear", ratio)` once the row below is read.
+    """
+    empty = RowTokens([], [])
+    window = collections.deque([empty, empty], maxlen=3)
+    for line in itertools.chain(lines, [""]):
+        window.append(tokenize_row(line) if line else empty)
+        above, row, below = window
+        columns = [above.columns, row.columns, below.columns]
+        for start, end, value in row.numbers:
+            if any(_has_symbol_between(c, start - 1, end) for c in columns):
+                yield "part", value
+        starts = [above.starts, row.starts, below.starts]
+        for column, char in row.symbols:
+            if char != "*":
+                continue
+            values = [
+                value
+                for tokens, row_starts in zip(window, starts)
+                for value in _numbers_around(tokens, row_starts, column)
+            ]
+            if len(values) == 2:
+                yield "gear", values[0] * values[1]
+
+
+class SparseSchematic(NamedTuple):
+    """The number values and, for each symbol, the indices of adjacent numbers."""
+
+    values: list[int]
+    symbols: list[tuple[str, list[int]]]
+
+
+def sparse_schematic(text: str | bytes) -> SparseSchematic:
+    """Index only the tokens of a schematic, ignoring the empty cells.
+
+    Each digit cell is hashed to the index of its number so that the
+    neighbours of a symbol can be resolved without building a dense grid.
+    """
+    if not isinstance(text, str):
+        text = bytes(text).decode()
+    values: list[int] = []
+    cells: dict[tuple[int, int], int] = {}
+    symbols: list[tuple[int, int, str]] = []
+    for y, line in enumerate(text.splitlines()):
+        tokens = tokenize_row(line)
+        for start, end, value in tokens.numbers:
+            for x in range(start, end):
+                cells[(y, x)] = len(values)
+            values.append(value)
+        symbols.extend((y, x, char) for x, char in tokens.symbols)
+    return SparseSchematic(
+        values,
+        [
+            (
+                char,
+                sorted(
+                    {
+                        cells[(y + dy, x + dx)]
+                        for dy in (-1, 0, 1)
+                        for dx in (-1, 0, 1)
+                        if (y + dy, x + dx) in cells
+                    }
+                ),
             )
+            for y, x, char in symbols
+        ],
+    )
+
+
+def part_one(inputs: str | None = None):  # pragma: no cover
+    with utils.load(3, "bytes", inputs=inputs) as contents:
+        return sum(get_part_numbers(contents))
+
 
-    return tuple(results)
+def part_two(inputs: str | None = None):  # pragma: no cover
+    with utils.load(3, "bytes", inputs=inputs) as contents:
+        return sum(get_gear_ratios(contents))
 
 
 def main():
-    with utils.contents() as contents:
-        utils.print_part_one(sum(get_part_numbers((contents))))
-        utils.print_part_two(sum(get_gear_ratios((contents))))
+    utils.print_part_one(part_one())
+    utils.print_part_two(part_two())
 
 
 if __name__ == "__main__":
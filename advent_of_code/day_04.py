@@ -1,52 +1,145 @@
+from __future__ import annotations
+
+import collections
 import re
-from typing import Callable
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, NamedTuple
 
 from advent_of_code import utils
 
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    np = utils.lazy_import("numpy")
+
 
 CARD_WINNING_MINE = re.compile(r"Card\s*(\d+):\s*(.*?)\s*\|\s*(.*)")
 DIGITS = re.compile(r"\d+")
 
 
-def scores(
-    input: str, calc_score: Callable[[int], int] = lambda x: 2 ** (x - 1)
-) -> dict[int, int]:
-    """Calculate the core for each scratch card."""
-    results = {}
+class Cards(NamedTuple):
+    """The ids of the cards and fixed-width matrices of their numbers.
+
+    Rows with fewer numbers are padded with values that never match.
+    """
+
+    ids: np.ndarray
+    winning: np.ndarray
+    mine: np.ndarray
+
+    def match_counts(self) -> np.ndarray:
+        """Count the distinct numbers on each card that are winning numbers."""
+        mine = np.sort(self.mine, axis=1)
+        distinct = np.ones(mine.shape, dtype=bool)
+        distinct[:, 1:] = mine[:, 1:] != mine[:, :-1]
+        hits = (mine[:, :, None] == self.winning[:, None, :]).any(axis=2)
+        return (hits & distinct).sum(axis=1)
+
+
+def _to_matrix(rows: list[list[str]], fill: int) -> np.ndarray:
+    """Convert rows of digit strings to a matrix, padding short rows."""
+    lengths = np.asarray([len(row) for row in rows], dtype=np.int64)
+    matrix = np.full((len(rows), lengths.max(initial=0)), fill, dtype=np.int64)
+    matrix[np.arange(matrix.shape[1]) < lengths[:, None]] = np.asarray(
+        [value for row in rows for value in row], dtype=np.int64
+    )
+    return matrix
+
+
+def parse_cards(input: str) -> Cards:
+    """Parse the scratch cards into integer matrices."""
+    ids, winning, mine = [], [], []
     for match in CARD_WINNING_MINE.finditer(input):
         card, _winning, _mine = match.groups()
-        winning = set(DIGITS.findall(_winning))
-        mine = set(DIGITS.findall(_mine))
-        matches = mine & winning
-        if len(matches):
-            results[int(card)] = calc_score(len(matches))
-        else:
-            results[int(card)] = 0
-    return results
+        ids.append(int(card))
+        winning.append(DIGITS.findall(_winning))
+        mine.append(DIGITS.findall(_mine))
+    return Cards(
+        np.asarray(ids, dtype=np.int64), _to_matrix(winning, -1), _to_matrix(mine, -2)
+    )
+
+
+def match_counts(input: str) -> np.ndarray:
+    """Count the matching numbers on each scratch card."""
+    return parse_cards(input).match_counts()
+
+
+def scores(
+    input: str,
+    calc_score: Callable[[np.ndarray], np.ndarray] = lambda x: 2 ** (x - 1),
+) -> dict[int, int]:
+    """Calculate the core for each scratch card.
+
+    `calc_score` is applied once to the array of match counts and cards
+    without any matches score 0.
+    """
+    cards = parse_cards(input)
+    counts = cards.match_counts()
+    values = np.where(counts > 0, calc_score(np.maximum(counts, 1)), 0)
+    return dict(zip(cards.ids.tolist(), values.tolist()))
 
 
 def num_cards(input: str) -> int:
-    """Count the number of cards."""
+    """Count the number of cards.
+
+    Each card only wins copies of the cards that follow it, so the number of
+    copies can be propagated forward in a single pass.
+    """
     card_scores = scores(input, calc_score=lambda x: x)
     cards = sorted(card_scores)
-    winnings = []
+    copies = [1] * len(cards)
+    for i, card in enumerate(cards):
+        for j in range(i + 1, min(i + 1 + card_scores[card], len(cards))):
+            copies[j] += copies[i]
+    return sum(copies)
+
+
+class RunningTotals(NamedTuple):
+    """Running totals after processing a scratch card."""
+
+    card: int
+    score: int
+    cards: int
+
+
+def stream_cards(
+    lines: Iterable[str], calc_score: Callable[[int], int] = lambda x: 2 ** (x - 1)
+) -> Iterator[RunningTotals]:
+    """Process scratch cards one line at a time, yielding the running totals.
+
+    A card can only win copies of the next `matches` cards, so only a window
+    of pending copies for the upcoming cards is kept.
+    """
+    pending: collections.deque[int] = collections.deque()
+    score = cards = 0
+    for line in lines:
+        if (match := CARD_WINNING_MINE.search(line)) is None:
+            continue
+        card, _winning, _mine = match.groups()
+        matches = len(set(DIGITS.findall(_mine)) & set(DIGITS.findall(_winning)))
+        copies = 1 + (pending.popleft() if pending else 0)
+        pending.extend([0] * (matches - len(pending)))
+        for i in range(matches):
+            pending[i] += copies
+        score += calc_score(matches) if matches else 0
+        cards += copies
+        yield RunningTotals(int(card), score, cards)
+
+
+def part_one(inputs: str | None = None):  # pragma: no cover
+    with utils.load(4, "lines", inputs=inputs) as lines:
+        (totals,) = collections.deque(stream_cards(lines), maxlen=1)
+        return totals.score
 
-    def count_cards(card: int) -> None:
-        score = card_scores[card]
-        last_card = min(card + score, cards[-1])
-        winnings.extend(cards[card:last_card])
-        for c in cards[card:last_card]:
-            count_cards(c)
 
-    for card in cards:
-        count_cards(card)
-    return len(winnings) + len(cards)
+def part_two(inputs: str | None = None):  # pragma: no cover
+    with utils.load(4, "lines", inputs=inputs) as lines:
+        (totals,) = collections.deque(stream_cards(lines), maxlen=1)
+        return totals.cards
 
 
 def main():
-    with utils.contents() as contents:
-        utils.print_part_one(sum(scores(contents).values()))
-        utils.print_part_two(num_cards(contents))
+    utils.print_part_one(part_one())
+    utils.print_part_two(part_two())
 
 
 if __name__ == "__main__":
@@ -1,15 +1,39 @@
 """Code for day 5."""
+
+from __future__ import annotations
+
 import bisect
 from collections import defaultdict
+import functools
+import hashlib
+import os
 import re
-from typing import Callable, Mapping, NamedTuple, Sequence, TypeAlias
+import shutil
+import tempfile
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Sequence,
+    TypeAlias,
+)
 
 from advent_of_code import utils
 
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    np = utils.lazy_import("numpy")
+
 Paths: TypeAlias = tuple[str, ...]
 ItemizedSeedMappings: TypeAlias = dict[int, tuple[int, ...]]
 MAPS = re.compile(r"^(\w+)-to-(\w+) map:\n([\s\S]+?)(?:^$|\Z)", re.M)
 DIGIT = re.compile(r"\d+")
+MIN_VALUE = -(2**63)
+MAX_VALUE = 2**63 - 1
 
 
 class AlmanacRow(NamedTuple):
@@ -52,6 +76,81 @@ def read_input(input: str):
     return seeds, paths, dict(almanac)
 
 
+def read_arrays(
+    input: str, cache_dir: str | os.PathLike | None = None
+) -> tuple[np.ndarray, Paths, np.ndarray]:
+    """Convert the input to arrays of the seeds and rows, and the paths.
+
+    Each row is stored as `(layer, dest_start, src_start, range_length)`, where
+    `layer` is the index of the row's destination in the paths. If `cache_dir`
+    is given, the arrays are stored there keyed by the hash of the input, and
+    later calls with the same input memory-map them instead of parsing the
+    text. If the cache cannot be written or read, the parsed arrays are
+    returned instead.
+    """
+    if cache_dir is None:
+        return almanac_arrays(*read_input(input))
+    path = os.path.join(cache_dir, hashlib.sha256(input.encode()).hexdigest())
+    arrays = None
+    try:
+        if not os.path.isdir(path):
+            arrays = almanac_arrays(*read_input(input))
+            os.makedirs(cache_dir, exist_ok=True)
+            write_cache(path, *arrays)
+        return load_cache(path)
+    except (OSError, ValueError, EOFError):
+        return almanac_arrays(*read_input(input)) if arrays is None else arrays
+
+
+def almanac_arrays(
+    seeds: Sequence[int],
+    paths: Sequence[str],
+    almanac: Mapping[tuple[str, str], Sequence[AlmanacRow]],
+) -> tuple[np.ndarray, Paths, np.ndarray]:
+    """Convert a parsed almanac to the arrays used by `read_arrays`."""
+    rows = [
+        (i, *row)
+        for i, (src, dest) in enumerate(zip(paths[:-1], paths[1:]), start=1)
+        for row in almanac.get((src, dest), ())
+    ]
+    return (
+        np.asarray(seeds, dtype=np.int64),
+        tuple(paths),
+        np.asarray(rows, dtype=np.int64).reshape(-1, 4),
+    )
+
+
+def write_cache(
+    path: str | os.PathLike, seeds: np.ndarray, paths: Paths, rows: np.ndarray
+) -> None:
+    """Write the arrays of an almanac to a directory of `.npy` files.
+
+    The files are written to a temporary directory which is then moved into
+    place, so a reader never sees a partial cache. If another writer won the
+    race the temporary directory is dropped, otherwise the error is raised.
+    """
+    tmp = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        np.save(os.path.join(tmp, "seeds.npy"), seeds)
+        np.save(os.path.join(tmp, "rows.npy"), rows)
+        with open(os.path.join(tmp, "paths.txt"), "w") as fp:
+            fp.write("\n".join(paths))
+        os.replace(tmp, path)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not os.path.isdir(path):
+            raise
+
+
+def load_cache(path: str | os.PathLike) -> tuple[np.ndarray, Paths, np.ndarray]:
+    """Memory-map the arrays of an almanac written by `write_cache`."""
+    with open(os.path.join(path, "paths.txt")) as fp:
+        paths = tuple(fp.read().split("\n"))
+    seeds = np.load(os.path.join(path, "seeds.npy"), mmap_mode="r")
+    rows = np.load(os.path.join(path, "rows.npy"), mmap_mode="r")
+    return seeds, paths, rows
+
+
 def converter_factory(row: AlmanacRow) -> Callable[[int], int | None]:
     """Create a converter that uses the range information."""
     dest_start, src_start, range_length = row
@@ -66,18 +165,124 @@ def converter_factory(row: AlmanacRow) -> Callable[[int], int | None]:
     return converter
 
 
-def trails(input: str) -> tuple[Paths, ItemizedSeedMappings]:
+class LayerMap(NamedTuple):
+    """A compiled, piecewise-linear map between two layers of the almanac.
+
+    The values in `[starts[i], starts[i + 1])` are moved by `offsets[i]`. The
+    first start is the smallest int64 so every value falls in a piece.
+    """
+
+    starts: np.ndarray
+    offsets: np.ndarray
+
+    def __call__(self, values: np.ndarray) -> np.ndarray:
+        """Map an array of values through the layer."""
+        values = np.asarray(values, dtype=np.int64)
+        return values + self.offsets[np.searchsorted(self.starts, values, "right") - 1]
+
+    def split(
+        self, starts: np.ndarray, lengths: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Map a batch of ranges, splitting them on the breakpoints of the layer.
+
+        Returns the flat starts and lengths of the mapped fragments, in the
+        order of the input ranges and then of the pieces they overlap.
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        lengths = np.asarray(lengths, dtype=np.int64)
+        keep = lengths > 0
+        starts, ends = starts[keep], starts[keep] + lengths[keep]
+        first = np.searchsorted(self.starts, starts, "right") - 1
+        last = np.searchsorted(self.starts, ends - 1, "right") - 1
+        counts = last - first + 1
+        ranges = np.repeat(np.arange(len(starts)), counts)
+        pieces = first[ranges] + (
+            np.arange(len(ranges)) - np.repeat(np.cumsum(counts) - counts, counts)
+        )
+        piece_ends = np.append(self.starts[1:], MAX_VALUE)
+        fragment_starts = np.maximum(starts[ranges], self.starts[pieces])
+        fragment_ends = np.minimum(ends[ranges], piece_ends[pieces])
+        return (
+            fragment_starts + self.offsets[pieces],
+            fragment_ends - fragment_starts,
+        )
+
+    def then(self, other: "LayerMap") -> "LayerMap":
+        """Compose this map with another, such that `other` is applied second.
+
+        The image of each piece of this map is split on the breakpoints of
+        `other` that fall inside it, and neighbouring pieces with the same
+        offset are merged.
+        """
+        starts = self.starts.tolist()
+        breakpoints = [self.starts]
+        for i, (start, offset) in enumerate(zip(starts, self.offsets.tolist())):
+            lo = np.searchsorted(other.starts, start + offset, "right")
+            hi = (
+                np.searchsorted(other.starts, starts[i + 1] + offset, "left")
+                if i + 1 < len(starts)
+                else len(other.starts)
+            )
+            breakpoints.append(other.starts[lo:hi] - offset)
+        points = np.unique(np.concatenate(breakpoints))
+        offsets = other(self(points)) - points
+        keep = np.concatenate(([True], offsets[1:] != offsets[:-1]))
+        return LayerMap(points[keep], offsets[keep])
+
+
+def compile_layer(almanac: Sequence[AlmanacRow]) -> LayerMap:
+    """Compile the rows of a layer into sorted breakpoint and offset arrays."""
+    return compile_rows(np.asarray(almanac, dtype=np.int64).reshape(-1, 3))
+
+
+def compile_rows(rows: np.ndarray) -> LayerMap:
+    """Compile an array of `(dest_start, src_start, range_length)` rows.
+
+    Each row contributes a breakpoint at its start, moved by its offset, and
+    one at its end, moved by nothing. When a row ends where the next starts,
+    only the start of the next row is kept.
+    """
+    rows = rows[np.argsort(rows[:, 1], kind="stable")]
+    starts = np.empty(2 * len(rows) + 1, dtype=np.int64)
+    offsets = np.zeros_like(starts)
+    starts[0] = MIN_VALUE
+    starts[1::2] = rows[:, 1]
+    starts[2::2] = rows[:, 1] + rows[:, 2]
+    offsets[1::2] = rows[:, 0] - rows[:, 1]
+    keep = np.append(starts[:-1] != starts[1:], True)
+    return LayerMap(starts[keep], offsets[keep])
+
+
+def compile_layers(paths: Paths, rows: np.ndarray) -> dict[str, LayerMap]:
+    """Compile the rows of every layer, keyed by destination.
+
+    The rows are grouped on their layer column, so an array memory-mapped by
+    `load_cache` is compiled without converting it to Python objects.
+    """
+    rows = rows[np.argsort(rows[:, 0], kind="stable")]
+    bounds = np.searchsorted(rows[:, 0], np.arange(1, len(paths) + 1)).tolist()
+    return {
+        dest: compile_rows(rows[lo:hi, 1:])
+        for dest, lo, hi in zip(paths[1:], bounds[:-1], bounds[1:])
+    }
+
+
+def trails(
+    input: str, cache_dir: str | os.PathLike | None = None
+) -> tuple[Paths, ItemizedSeedMappings]:
     """Find the paths and the seed mappings from the input text.
 
-    Use the `read_input` function to return the seeds, paths and the encodings
-    for the almanac. Create a converter that takes each seed and converts it
-    to the next level and keep a record of it.
+    Use the `compiled_almanac` function to return the seeds, paths and the
+    compiled layers of the almanac. Map all the seeds to the next level at
+    once, keeping a record of each level.
 
     Parameters
     ----------
     input : str
         The string describing the seeds and how to convert from seeds to
         locations.
+    cache_dir : str | os.PathLike | None
+        The directory used to cache the parsed almanac, see `read_arrays`.
 
     Returns
     -------
@@ -87,33 +292,91 @@ def trails(input: str) -> tuple[Paths, ItemizedSeedMappings]:
         dictionary can be made from each path and seed to find the exact trail
         that has been traced.
     """
-    seeds, paths, _almanac = read_input(input)
-    almanac: Mapping[tuple[str, str], list[Callable[[int], int | None]]] = {
-        k: [converter_factory(w) for w in v] for k, v in _almanac.items()
+    seeds, paths, layers = compiled_almanac(input, cache_dir)
+    values = np.asarray(seeds, dtype=np.int64)
+    columns = [values]
+    for dest in paths[1:]:
+        values = layers[dest](values)
+        columns.append(values)
+    mapped: ItemizedSeedMappings = {
+        path[0]: tuple(path) for path in np.stack(columns, axis=1).tolist()
     }
-    mapped: ItemizedSeedMappings = {}
-    for seed in seeds:
-        path = [seed]
-        for src, dest in zip(paths[:-1], paths[1:]):
-            val = path[-1]
-            for converter in almanac[(src, dest)]:
-                next_val = converter(val)
-                if next_val is not None:
-                    path.append(next_val)
-                    break
-            else:
-                path.append(val)
-        mapped[seed] = tuple(path)
-    return tuple(paths), mapped
-
-
-def lowest_location(input: str, loc: str) -> int:
+    return paths, mapped
+
+
+@functools.lru_cache(maxsize=8)
+def compiled_almanac(
+    input: str, cache_dir: str | os.PathLike | None = None
+) -> tuple[np.ndarray, Paths, dict[str, LayerMap]]:
+    """Get the seeds, paths and compiled layers, keyed by destination, of an input."""
+    seeds, paths, rows = read_arrays(input, cache_dir)
+    return seeds, paths, compile_layers(paths, rows)
+
+
+def compose_layers(
+    layers: Mapping[str, LayerMap], paths: Paths, src: str, dest: str
+) -> LayerMap:
+    """Compose the layers, keyed by destination, from `src` to `dest`."""
+    start, stop = paths.index(src), paths.index(dest)
+    if start > stop:
+        raise ValueError(f"'{dest}' comes before '{src}' in {paths}.")
+    return functools.reduce(
+        LayerMap.then,
+        (layers[name] for name in paths[start + 1 : stop + 1]),
+        compile_layer([]),
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def transform(
+    input: str,
+    src: str = "seed",
+    dest: str = "location",
+    cache_dir: str | os.PathLike | None = None,
+) -> LayerMap:
+    """Get the composition of the layers of an almanac between two positions.
+
+    The composed map is cached, so repeated queries cost a single binary search.
+    """
+    _, paths, layers = compiled_almanac(input, cache_dir)
+    return compose_layers(layers, paths, src, dest)
+
+
+def lowest_location(
+    input: str,
+    loc: str,
+    inverse: bool = False,
+    cache_dir: str | os.PathLike | None = None,
+) -> int:
     """Find the lowest location at a specific position
 
     The calculation assume the seeds are individual starting points."""
-    paths, mappings = trails(input)
-    i = paths.index(loc)
-    return min(mapping[i] for mapping in mappings.values())
+    if inverse:
+        seeds, _, _ = compiled_almanac(input, cache_dir)
+        return lowest_preimage(
+            transform(input, "seed", loc, cache_dir), ((seed, 1) for seed in seeds)
+        )
+    return min(
+        int(values.min()) for _, values in iter_layer(input, loc, cache_dir=cache_dir)
+    )
+
+
+def iter_layer(
+    input: str,
+    loc: str,
+    chunk_size: int = 1 << 16,
+    cache_dir: str | os.PathLike | None = None,
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Lazily map the seeds to a single position, one chunk at a time.
+
+    Yields arrays of seeds and their values at `loc`, so only `chunk_size`
+    values are held at once rather than the whole trail of every seed.
+    """
+    seeds, _, _ = compiled_almanac(input, cache_dir)
+    layer = transform(input, "seed", loc, cache_dir)
+    for i in range(0, len(seeds), chunk_size):
+        chunk = np.asarray(seeds[i : i + chunk_size], dtype=np.int64)
+        yield chunk, layer(chunk)
 
 
 def ranged_converter_factory(
@@ -121,13 +384,10 @@ def ranged_converter_factory(
 ) -> Callable[[tuple[int, int]], Sequence[tuple[int, int]]]:
     """Create a converter using the almanac over ranges.
 
-    The converter works by sorting the almanac rows and, if the item is
-    out-of-range, will return the item as is. If in range, it will find the
-    specific range that is relevant for the start and stop of the range. If
-    these are the same almanac record, then use a single converter.
-    If it spans multiple ranges, split the first and last range on its overlap;
-    and then convert the intermediate ranges as the span the full range of
-    values.
+    The almanac is compiled into a `LayerMap`, whose breakpoints include the
+    gaps between the rows. A range is split on every breakpoint that falls
+    inside it and each fragment is moved by the offset of its piece. Values
+    outside the rows are returned as is.
 
     Parameters
     ----------
@@ -139,74 +399,240 @@ def ranged_converter_factory(
     Callable[[tuple[int, int]], Sequence[tuple[int, int]]]
         The converter as described in the description.
     """
-    _almanac = sorted(almanac, key=lambda row: row.src_start)
-
-    almanac = [_almanac[0]]
-    for a in _almanac[1:]:
-        if span := (a.src_start - almanac[-1].src_end):
-            almanac.append(
-                AlmanacRow(
-                    almanac[-1].src_end,
-                    almanac[-1].src_end,
-                    span,
-                )
-            )
-
-        almanac.append(a)
-    almanac_start, almanac_end = _almanac[0].src_start, _almanac[-1].src_end
+    layer = compile_layer(almanac)
 
     def convert(val: tuple[int, int]) -> Sequence[tuple[int, int]]:
-        start, stop = val[0], val[0] + val[1]
-        if start >= almanac_end or stop <= almanac_start:
-            return (val,)
-        start_grp, stop_grp = (
-            bisect.bisect_right(almanac, start, key=lambda row: row.src_start),
-            bisect.bisect_left(almanac, stop, key=lambda row: row.src_start),
-        )
-        if start_grp == 0:
-            return (val,)
-        if start_grp == stop_grp:
-            return ((val[0] + almanac[start_grp - 1].offset, val[1]),)
-        first, *intermediate, last = almanac[start_grp - 1 : stop_grp]
-        result = [
-            (start + first.offset, first.src_end - start),
-            *[(row.dest_start, row.range_length) for row in intermediate],
-            (last.src_start + last.offset, stop - last.src_start),
-        ]
-        return tuple(result)
+        starts, lengths = layer.split(np.asarray(val[:1]), np.asarray(val[1:]))
+        return tuple(zip(starts.tolist(), lengths.tolist()))
 
     return convert
 
 
-def ranged_trails(input: str) -> dict[str, Sequence[tuple[int, int]]]:
-    """Find the ranges that map to each layer."""
-    _seeds, paths, _almanac = read_input(input)
-    results: dict[str, Sequence[tuple[int, int]]] = dict(
-        seed=tuple((a, b) for a, b in zip(_seeds[0::2], _seeds[1::2]))
-    )
+class IntervalSet(NamedTuple):
+    """A set of integers stored as sorted, disjoint and non-adjacent ranges."""
+
+    starts: np.ndarray
+    lengths: np.ndarray
+
+    @classmethod
+    def from_ranges(cls, ranges: Iterable[tuple[int, int]]) -> "IntervalSet":
+        """Create a normalized set from (start, length) ranges."""
+        ranges = np.asarray(tuple(ranges), dtype=np.int64).reshape(-1, 2)
+        return cls.normalized(ranges[:, 0], ranges[:, 1])
+
+    @classmethod
+    def normalized(cls, starts: np.ndarray, lengths: np.ndarray) -> "IntervalSet":
+        """Sort the ranges, drop the empty ones and merge those that touch."""
+        keep = lengths > 0
+        order = np.argsort(starts[keep], kind="stable")
+        starts, ends = starts[keep][order], (starts + lengths)[keep][order]
+        if not len(starts):
+            return cls(starts, ends - starts)
+        reach = np.maximum.accumulate(ends)
+        first = np.flatnonzero(np.concatenate(([True], starts[1:] > reach[:-1])))
+        merged_starts = starts[first]
+        return cls(merged_starts, np.maximum.reduceat(ends, first) - merged_starts)
+
+    def map(self, layer: LayerMap) -> "IntervalSet":
+        """Pass all the ranges through a layer at once and normalize the result."""
+        return IntervalSet.normalized(*layer.split(self.starts, self.lengths))
+
+    def ranges(self) -> tuple[tuple[int, int], ...]:
+        """Get the (start, length) ranges in the set."""
+        return tuple(zip(self.starts.tolist(), self.lengths.tolist()))
 
-    for src_name, dest_name in zip(paths[:-1], paths[1:]):
-        almanac = ranged_converter_factory(_almanac[(src_name, dest_name)])
-        output = ()
-        for src in results[src_name]:
-            output = (*output, *almanac(src))
 
-        results[dest_name] = output
+def ranged_trails(
+    input: str, cache_dir: str | os.PathLike | None = None
+) -> dict[str, Sequence[tuple[int, int]]]:
+    """Find the ranges that map to each layer.
+
+    The ranges are normalized after every layer, so the number of ranges
+    only grows with the number of distinct breakpoints.
+    """
+    _seeds, paths, layers = compiled_almanac(input, cache_dir)
+    ranges = IntervalSet.normalized(_seeds[0::2], _seeds[1::2])
+    results: dict[str, Sequence[tuple[int, int]]] = dict(seed=ranges.ranges())
+
+    for dest_name in paths[1:]:
+        ranges = ranges.map(layers[dest_name])
+        results[dest_name] = ranges.ranges()
     return results
 
 
-def lowest_ranged_location(input: str, loc: str) -> int:
-    """Find the lower location at a specific position."""
+def lowest_preimage(composed: LayerMap, seeds: Iterable[tuple[int, int]]) -> int:
+    """Find the lowest location whose preimage is one of the seeds.
 
-    paths = ranged_trails(input)
+    The pieces of the composed seed-to-location map are walked in order of
+    their smallest location, which inverts the map one piece at a time. The
+    search stops as soon as no remaining piece can reach a lower location, so
+    the work is bounded by the size of the almanac, not the number of seeds.
+    """
+    ranges = IntervalSet.from_ranges(seeds)
+    if not len(ranges.starts):
+        raise ValueError("There are no seeds to locate.")
+    ends = ranges.starts + ranges.lengths
+    piece_starts = np.maximum(composed.starts, ranges.starts[0])
+    piece_ends = np.minimum(np.append(composed.starts[1:], MAX_VALUE), ends[-1])
+    keep = piece_starts < piece_ends
+    piece_starts, piece_ends = piece_starts[keep], piece_ends[keep]
+    offsets = composed.offsets[keep]
+    lowest = None
+    for i in np.argsort(piece_starts + offsets, kind="stable").tolist():
+        if lowest is not None and piece_starts[i] + offsets[i] >= lowest:
+            break
+        j = np.searchsorted(ends, piece_starts[i], "right")
+        if j < len(ends) and ranges.starts[j] < piece_ends[i]:
+            location = int(max(piece_starts[i], ranges.starts[j]) + offsets[i])
+            lowest = location if lowest is None else min(lowest, location)
+    return lowest
+
+
+def lowest_ranged_location(
+    input: str,
+    loc: str,
+    inverse: bool = False,
+    cache_dir: str | os.PathLike | None = None,
+) -> int:
+    """Find the lower location at a specific position."""
+    if inverse:
+        seeds, _, _ = compiled_almanac(input, cache_dir)
+        return lowest_preimage(
+            transform(input, "seed", loc, cache_dir), zip(seeds[0::2], seeds[1::2])
+        )
+    paths = ranged_trails(input, cache_dir)
     return min(el[0] for el in paths[loc])
 
 
+class MutableLayer:
+    """A layer of the almanac whose rows can be edited in place.
+
+    The rows are kept sorted by their source start, so edits are located with
+    a binary search, and the compiled `LayerMap` is only rebuilt when it is
+    requested after an edit.
+    """
+
+    def __init__(self, rows: Iterable[AlmanacRow] = ()):
+        self._rows: list[AlmanacRow] = []
+        self._starts: list[int] = []
+        self._compiled: LayerMap | None = None
+        for row in rows:
+            self.insert(row)
+
+    def __iter__(self) -> Iterator[AlmanacRow]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def insert(self, row: AlmanacRow) -> None:
+        """Add a row, which must not overlap the existing rows."""
+        i = bisect.bisect_left(self._starts, row.src_start)
+        if (i and self._rows[i - 1].src_end > row.src_start) or (
+            i < len(self._rows) and self._rows[i].src_start < row.src_end
+        ):
+            raise ValueError(f"{row!r} overlaps an existing row.")
+        self._rows.insert(i, row)
+        self._starts.insert(i, row.src_start)
+        self._compiled = None
+
+    def remove(self, row: AlmanacRow) -> None:
+        """Remove a row, raising a `ValueError` if it is not present."""
+        i = bisect.bisect_left(self._starts, row.src_start)
+        if i == len(self._rows) or self._rows[i] != row:
+            raise ValueError(f"{row!r} is not in the layer.")
+        del self._rows[i]
+        del self._starts[i]
+        self._compiled = None
+
+    @property
+    def compiled(self) -> LayerMap:
+        """Get the compiled map of the layer."""
+        if self._compiled is None:
+            self._compiled = compile_layer(self._rows)
+        return self._compiled
+
+
+class MutableAlmanac:
+    """An almanac whose layers can be edited and then queried again.
+
+    Compositions of layers are cached and, after an edit, only those that
+    include the edited layer are dropped.
+    """
+
+    def __init__(self, input: str, cache_dir: str | os.PathLike | None = None):
+        seeds, paths, rows = read_arrays(input, cache_dir)
+        self.seeds = seeds
+        self.paths = paths
+        self.layers = {
+            dest: MutableLayer(
+                map(AlmanacRow._make, rows[rows[:, 0] == i, 1:].tolist())
+            )
+            for i, dest in enumerate(paths[1:], start=1)
+        }
+        self._compositions: dict[tuple[str, str], LayerMap] = {}
+
+    def _invalidate(self, dest: str) -> None:
+        """Drop the cached compositions that pass through a layer."""
+        i = self.paths.index(dest)
+        self._compositions = {
+            (src, end): composed
+            for (src, end), composed in self._compositions.items()
+            if not self.paths.index(src) < i <= self.paths.index(end)
+        }
+
+    def insert(self, dest: str, row: AlmanacRow) -> None:
+        """Add a row to the layer that maps to `dest`."""
+        self.layers[dest].insert(row)
+        self._invalidate(dest)
+
+    def remove(self, dest: str, row: AlmanacRow) -> None:
+        """Remove a row from the layer that maps to `dest`."""
+        self.layers[dest].remove(row)
+        self._invalidate(dest)
+
+    def transform(self, src: str = "seed", dest: str = "location") -> LayerMap:
+        """Get the composition of the layers between two positions."""
+        if (src, dest) not in self._compositions:
+            self._compositions[(src, dest)] = compose_layers(
+                {name: layer.compiled for name, layer in self.layers.items()},
+                self.paths,
+                src,
+                dest,
+            )
+        return self._compositions[(src, dest)]
+
+    def lowest_location(self, loc: str = "location") -> int:
+        """Find the lowest location of the individual seeds."""
+        return int(self.transform("seed", loc)(self.seeds).min())
+
+    def lowest_ranged_location(self, loc: str = "location") -> int:
+        """Find the lowest location of the seed ranges."""
+        return lowest_preimage(
+            self.transform("seed", loc), zip(self.seeds[0::2], self.seeds[1::2])
+        )
+
+
+def part_one(inputs: str | None = None):  # pragma: no cover
+    """Find the lowest location of the individual seeds."""
+    with utils.load(5, inputs=inputs) as contents:
+        return lowest_location(
+            contents, "location", cache_dir=utils.cache_path(5, inputs)
+        )
+
+
+def part_two(inputs: str | None = None):  # pragma: no cover
+    """Find the lowest location of the seed ranges."""
+    with utils.load(5, inputs=inputs) as contents:
+        return lowest_ranged_location(
+            contents, "location", cache_dir=utils.cache_path(5, inputs)
+        )
+
+
 def main():
     """Find the results for part one and two."""
-    with utils.contents() as contents:
-        utils.print_part_one( lowest_location(contents, "location"))
-        utils.print_part_two( lowest_ranged_location(contents, "location"))
+    utils.print_part_one(part_one())
+    utils.print_part_two(part_two())
 
 
 if __name__ == "__main__":
@@ -1,10 +1,22 @@
+from __future__ import annotations
+
 import functools
 import math
+import numbers
 import re
-from typing import NamedTuple, Sequence
+from typing import TYPE_CHECKING, NamedTuple, Sequence
+
 import advent_of_code.utils as utils
 
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+else:
+    np = utils.lazy_import("numpy")
+
 DIGIT = re.compile(r"\d+")
+MAX_VECTORIZED_TIME = 2**31
+MAX_VECTORIZED_DISTANCE = 2**60
 
 
 class RaceRecords(NamedTuple):
@@ -35,14 +47,42 @@ def race(held_for: int, duration: int):
     return moved_for * held_for
 
 
+def winning_bounds(
+    *, race_duration: int, record_distance: int
+) -> tuple[int, int] | None:
+    """Get the shortest and longest hold times that beat the record, if any.
+
+    The hold times that win satisfy `held_for * (race_duration - held_for) >
+    record_distance`, so the bounds are found from the roots of the quadratic
+    using `math.isqrt` and corrected with exact integer comparisons.
+    """
+    if race_duration <= 0:
+        return None
+    if race(race_duration // 2, race_duration) <= record_distance:
+        return None
+    first = (race_duration - math.isqrt(race_duration**2 - 4 * record_distance)) // 2
+    first = max(first, 0)
+    while first > 0 and race(first - 1, race_duration) > record_distance:
+        first -= 1
+    while race(first, race_duration) <= record_distance:
+        first += 1
+    return first, min(race_duration - first, race_duration - 1)
+
+
+def race_combo_count(*, race_duration: int, record_distance: int) -> int:
+    """Count the race combos for specific race without listing them."""
+    bounds = winning_bounds(
+        race_duration=race_duration, record_distance=record_distance
+    )
+    return 0 if bounds is None else bounds[1] - bounds[0] + 1
+
+
 def race_combos(*, race_duration: int, record_distance: int) -> Sequence[int]:
     """Get the race combos for specific race."""
-    race_fn = functools.partial(race, duration=race_duration)
-    return tuple(
-        held_for
-        for held_for in range(race_duration)
-        if race_fn(held_for) > record_distance
+    bounds = winning_bounds(
+        race_duration=race_duration, record_distance=record_distance
     )
+    return () if bounds is None else tuple(range(bounds[0], bounds[1] + 1))
 
 
 def parse_input_to_race_combos(input: str) -> Sequence[Sequence[int]]:
@@ -62,31 +102,77 @@ third_race_combos = functools.partial(
 )
 
 
-def margin_of_error(*races: Sequence[int]):
-    """Calculate margin of error from multiple races."""
-    return math.prod(tuple(len(race) for race in races))
+def margin_of_error(*races: int | Sequence[int]) -> int:
+    """Calculate margin of error from the combos, or their counts, of multiple races."""
+    return math.prod(
+        int(race) if isinstance(race, numbers.Integral) else len(race) for race in races
+    )
 
 
-def margin_of_error_optimized(input: str) -> int:
-    race_details = parse_input(input, fix_kerning=True)[0]
-    race_fn = functools.partial(race, duration=race_details.time)
-    first = next(
-        held_for
-        for held_for in range(race_details.time)
-        if race_fn(held_for) > race_details.distance
-    )
-    last = next(
-        held_for
-        for held_for in reversed(range(race_details.time))
-        if race_fn(held_for) > race_details.distance
+def race_combo_counts(input: str, fix_kerning: bool = False) -> Sequence[int]:
+    """Parse input into the number of race combos of each race."""
+    return tuple(
+        race_combo_count(race_duration=race.time, record_distance=race.distance)
+        for race in parse_input(input, fix_kerning=fix_kerning)
     )
-    return last - first + 1
+
+
+def batch_race_combo_counts(
+    times: npt.ArrayLike, distances: npt.ArrayLike
+) -> np.ndarray:
+    """Count the race combos of many races at once.
+
+    Races whose squared duration or record could overflow int64 are solved
+    exactly with Python ints and, if there are any, an object array is
+    returned. The others are solved with a vectorized square root followed by
+    integer corrections of the bounds. Races that last no time have no combos,
+    and every negative record is beaten by the same hold times as -1.
+    """
+    times, distances = np.asarray(times), np.asarray(distances)
+    exact = (
+        (times > MAX_VECTORIZED_TIME) | (distances > MAX_VECTORIZED_DISTANCE)
+    ).astype(bool)
+    time = np.maximum(times[~exact], 0).astype(np.int64)
+    distance = np.maximum(distances[~exact], -1).astype(np.int64)
+    wins = (time > 0) & (race(time // 2, time) > distance)
+    root = np.sqrt(np.maximum(time * time - 4 * distance, 0)).astype(np.int64)
+    first = np.maximum((time - root) // 2, 0)
+    while (lower := wins & (first > 0) & (race(first - 1, time) > distance)).any():
+        first -= lower
+    while (higher := wins & (race(first, time) <= distance)).any():
+        first += higher
+    counts = np.zeros(len(times), dtype=object if exact.any() else np.int64)
+    counts[~exact] = np.where(wins, np.minimum(time - first, time - 1) - first + 1, 0)
+    counts[exact] = [
+        race_combo_count(race_duration=int(t), record_distance=int(d))
+        for t, d in zip(times[exact], distances[exact])
+    ]
+    return counts
+
+
+def batch_margin_of_error(times: npt.ArrayLike, distances: npt.ArrayLike) -> int:
+    """Calculate the margin of error of many races without listing any combos."""
+    return math.prod(batch_race_combo_counts(times, distances).tolist())
+
+
+def margin_of_error_optimized(input: str) -> int:
+    """Calculate the margin of error of the single race with the kerning fixed."""
+    return margin_of_error(*race_combo_counts(input, fix_kerning=True))
+
+
+def part_one(inputs: str | None = None):  # pragma: no cover
+    with utils.load(6, inputs=inputs) as contents:
+        return margin_of_error(*race_combo_counts(contents))
+
+
+def part_two(inputs: str | None = None):  # pragma: no cover
+    with utils.load(6, inputs=inputs) as contents:
+        return margin_of_error_optimized(contents)
 
 
 def main():
-    with utils.contents() as contents:
-        utils.print_part_one(margin_of_error(*parse_input_to_race_combos(contents)))
-        utils.print_part_two(margin_of_error_optimized(contents))
+    utils.print_part_one(part_one())
+    utils.print_part_two(part_two())
 
 
 if __name__ == "__main__":
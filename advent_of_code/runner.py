@@ -0,0 +1,156 @@
+"""Run the solutions of several days in parallel and report their timings."""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import importlib
+import json
+import os
+import pkgutil
+import re
+import resource
+import sys
+import time
+from typing import NamedTuple, Sequence
+
+import advent_of_code
+from advent_of_code import utils
+
+DAY_MODULE = re.compile(r"day_(\d+)$")
+PARTS = ("part_one", "part_two")
+
+
+class PartReport(NamedTuple):
+    """The result and resource usage of running a part of a day."""
+
+    day: int
+    part: int
+    result: int | str | None
+    wall_time: float
+    cpu_time: float
+    peak_memory: int
+    error: str | None = None
+
+
+def discover_days() -> tuple[int, ...]:
+    """Find the days that have a module in the package."""
+    return tuple(
+        sorted(
+            int(match.group(1))
+            for module in pkgutil.iter_modules(advent_of_code.__path__)
+            if (match := DAY_MODULE.match(module.name))
+        )
+    )
+
+
+def peak_memory() -> int:
+    """Get the peak resident set size of the current process in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_part(day: int, part: int, inputs: str | None = None) -> PartReport:
+    """Run a part of a day, timing it in wall-clock and CPU time.
+
+    The lazy imports of the day, such as numpy, are loaded before the timers
+    start, so the timings only cover solving the part.
+    """
+    module = importlib.import_module(f"advent_of_code.day_{day:02d}")
+    utils.import_lazy_modules(module)
+    solve = getattr(module, PARTS[part - 1])
+    wall_time, cpu_time = time.perf_counter(), time.process_time()
+    try:
+        result, error = solve(inputs), None
+    except Exception as e:
+        result, error = None, f"{type(e).__name__}: {e}"
+    return PartReport(
+        day,
+        part,
+        result,
+        time.perf_counter() - wall_time,
+        time.process_time() - cpu_time,
+        peak_memory(),
+        error,
+    )
+
+
+def run(
+    days: Sequence[int],
+    parts: Sequence[int] = (1, 2),
+    max_workers: int | None = None,
+    inputs: str | None = None,
+) -> tuple[PartReport, ...]:
+    """Run the parts of the days in a process pool.
+
+    Each part runs in a fresh process so that its peak memory is its own.
+    """
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers, max_tasks_per_child=1
+    ) as executor:
+        futures = [
+            executor.submit(run_part, day, part, inputs)
+            for day in days
+            for part in parts
+        ]
+        return tuple(future.result() for future in futures)
+
+
+def format_table(reports: Sequence[PartReport]) -> str:
+    """Format the reports as a plain text table."""
+    rows = [("Day", "Part", "Result", "Wall (s)", "CPU (s)", "Peak (MiB)")]
+    for report in reports:
+        rows.append(
+            (
+                f"{report.day:02d}",
+                str(report.part),
+                str(report.result) if report.error is None else report.error,
+                f"{report.wall_time:.4f}",
+                f"{report.cpu_time:.4f}",
+                f"{report.peak_memory / 2**20:.1f}",
+            )
+        )
+    widths = [max(map(len, column)) for column in zip(*rows)]
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+        for row in rows
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the days given on the command line and print the report."""
+    parser = argparse.ArgumentParser(
+        prog="python -m advent_of_code", description=__doc__
+    )
+    parser.add_argument("days", nargs="*", type=int, help="Days to run (default: all).")
+    parser.add_argument(
+        "--parts",
+        nargs="+",
+        type=int,
+        choices=(1, 2),
+        default=[1, 2],
+        help="Parts to run.",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Size of the pool.")
+    parser.add_argument("--inputs", default=None, help="Directory of the inputs.")
+    parser.add_argument("--json", action="store_true", help="Report as JSON.")
+    args = parser.parse_args(argv)
+
+    available = discover_days()
+    if missing := sorted(set(args.days) - set(available)):
+        parser.error(f"No module for day(s) {missing}.")
+    inputs = None if args.inputs is None else os.path.abspath(args.inputs)
+    start = time.perf_counter()
+    reports = run(args.days or available, args.parts, args.workers, inputs)
+    total = time.perf_counter() - start
+    if args.json:
+        print(
+            json.dumps(
+                {"parts": [report._asdict() for report in reports], "wall_time": total},
+                indent=2,
+            )
+        )
+    else:
+        print(format_table(reports))
+        print(f"Total wall time: {total:.4f}s")
+    return int(any(report.error is not None for report in reports))
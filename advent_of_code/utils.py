@@ -1,23 +1,87 @@
 import contextlib
 import glob
-import inspect
+import importlib
+import mmap
 import os
 import re
-from typing import Literal
+import sys
+import types
+from typing import IO, Iterator, Literal, TypeAlias
 
 import advent_of_code
 
+LoadMode: TypeAlias = Literal["text", "bytes", "mmap", "lines"]
+
+INPUTS = os.path.normpath(os.path.join(__file__, "..", "inputs"))
+
+
+class LazyModule(types.ModuleType):
+    """A module that is only imported when one of its attributes is used."""
+
+    def __getattr__(self, attr: str):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Get a module, deferring the import until it is first used."""
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+
+def import_lazy_modules(module: types.ModuleType) -> None:
+    """Import the lazy modules used by a module now, rather than on first use."""
+    for value in vars(module).values():
+        if isinstance(value, LazyModule):
+            value.__dict__.update(importlib.import_module(value.__name__).__dict__)
+
+
+def input_path(day: int, inputs: str | os.PathLike | None = None) -> str:
+    """Get the path to the input of a day, in `inputs` or the default directory."""
+    return os.path.join(INPUTS if inputs is None else inputs, f"day_{day:02d}.txt")
+
+
+def cache_path(day: int, inputs: str | os.PathLike | None = None) -> str:
+    """Get the directory used to cache the parsed input of a day."""
+    return os.path.join(
+        INPUTS if inputs is None else inputs, ".cache", f"day_{day:02d}"
+    )
+
+
+@contextlib.contextmanager
+def load(
+    day: int, mode: LoadMode = "text", inputs: str | os.PathLike | None = None
+) -> Iterator[str | bytes | mmap.mmap | IO[str]]:
+    """Load the input of a day from `inputs` or the default directory.
+
+    The input is read as a `str` ("text") or `bytes` ("bytes"), memory-mapped
+    read-only ("mmap") or opened as a text file to iterate over ("lines").
+    """
+    path = input_path(day, inputs)
+    if mode == "mmap":
+        with open(path, "rb") as fp, mmap.mmap(
+            fp.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            yield mm
+    elif mode == "lines":
+        with open(path) as fp:
+            yield fp
+    elif mode in ("text", "bytes"):
+        with open(path, "rb" if mode == "bytes" else "r") as fp:
+            yield fp.read()
+    else:
+        raise ValueError(f"Unknown load mode '{mode}'.")
+
 
 @contextlib.contextmanager
 def contents():  # pragma: no cover
-    frame_records = inspect.stack()[2]
-    calling_module = inspect.getmodulename(frame_records[1])
-    with open(
-        os.path.normpath(
-            os.path.join(__file__, "..", "inputs", f"{calling_module}.txt")
-        ),
-        "r",
-    ) as fp:
+    """Read the input of the calling module as text."""
+    calling_module = os.path.splitext(
+        os.path.basename(sys._getframe(2).f_code.co_filename)
+    )[0]
+    with open(os.path.join(INPUTS, f"{calling_module}.txt"), "r") as fp:
         yield fp.read()
 
 
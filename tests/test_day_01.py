@@ -1,4 +1,15 @@
+import mmap
+
 from advent_of_code import day_01
+import pytest
+
+DOCUMENT = """two1nine
+eightwothree
+abcone2threexyz
+xtwone3four
+4nineeightseven2
+zoneight234
+7pqrstsixteen"""
 
 
 def test_part_one():
@@ -31,6 +42,57 @@ zoneight234
     )
 
 
+def test_overlapping_words():
+    """Test that overlapping words resolve to the first and last digits."""
+    assert day_01.document_calibration("eightwo\noneight\nxtwonex") == 82 + 18 + 21
+
+
+def test_custom_vocabulary():
+    """Test that the number words can be swapped for another language."""
+    assert (
+        day_01.document_calibration(
+            "zweidrei1\nxvierzehnachtx",
+            vocabulary={
+                "eins": "1",
+                "zwei": "2",
+                "drei": "3",
+                "vier": "4",
+                "acht": "8",
+            },
+        )
+        == 21 + 48
+    )
+
+
+def test_nested_words():
+    """Test that a word contained in a longer word does not take precedence."""
+    automaton = day_01.WordAutomaton({"abcd": "1", "bc": "2", "d": "3"})
+    assert automaton.first("xabcd") == "1"
+    assert automaton.reversed().first("xabcd"[::-1]) == "3"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 40, 1 << 24])
+def test_chunk_ranges(tmp_path, chunk_size: int):
+    """Test that chunks cover the file and end on line boundaries."""
+    path = tmp_path / "document.txt"
+    path.write_text(DOCUMENT)
+    with open(path, "rb") as fp, mmap.mmap(
+        fp.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        ranges = day_01.chunk_ranges(mm, chunk_size)
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(mm)
+        assert all(a[1] == b[0] for a, b in zip(ranges[:-1], ranges[1:]))
+        assert all(mm[stop - 1 : stop] == b"\n" for _, stop in ranges[:-1])
+
+
+def test_file_calibration(tmp_path):
+    """Test that calibrating a file in parallel chunks matches the string version."""
+    path = tmp_path / "document.txt"
+    path.write_text(DOCUMENT)
+    assert day_01.file_calibration(path, chunk_size=16, max_workers=2) == 281
+    assert day_01.file_calibration(path) == 281
+
+
 if __name__ == "__main__":
     import pytest
     import sys
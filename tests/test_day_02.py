@@ -31,6 +31,47 @@ def test_part_two():
     )
 
 
+def test_parse_games():
+    """Test that games are parsed into columns, including unseen colors."""
+    table = day_02.parse_games(
+        """Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green
+Game 7: 1 purple, 2 green; 5 purple"""
+    )
+    assert table.ids.tolist() == [1, 7]
+    assert table.colors == ("blue", "red", "green", "purple")
+    assert table.column("blue").tolist() == [6, 0]
+    assert table.column("purple").tolist() == [0, 5]
+    assert table.maxes.tolist() == [[6, 4, 2, 0], [0, 0, 2, 5]]
+    assert day_02.possible_games({"green": 2, "purple": 5})(
+        "Game 7: 1 purple, 2 green; 5 purple\nGame 8: 1 red"
+    ) == (7,)
+
+
+def test_batch_feasibility():
+    """Test that many bags can be checked against a parsed log at once."""
+    table = day_02.parse_games(
+        """Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green
+    Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue
+    Game 3: 8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green; 5 green, 1 red
+    Game 4: 1 green, 3 red, 6 blue; 3 green, 6 red; 3 green, 15 blue, 14 red
+    Game 5: 6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green"""
+    )
+    configs = (
+        {"red": 12, "green": 13, "blue": 14},
+        {"red": 100, "green": 100, "blue": 100},
+        {"red": 4, "green": 3, "blue": 6, "yellow": 1},
+        {},
+    )
+    assert table.feasible(configs).tolist() == [
+        [True, True, False, False, True],
+        [True] * 5,
+        [True, True, False, False, False],
+        [False] * 5,
+    ]
+    assert table.possible_id_sums(configs).tolist() == [8, 15, 3, 0]
+    assert table.powers().sum() == 2286
+
+
 if __name__ == "__main__":
     import pytest
     import sys
@@ -1,4 +1,18 @@
 from advent_of_code import day_03
+import numpy as np
+import pytest
+from scipy.ndimage import label
+
+SAMPLE = """467..114..
+...*......
+..35..633.
+......#...
+617*......
+.....+.58.
+..592.....
+......755.
+...$.*....
+.664.598.."""
 
 
 def test_part_one():
@@ -43,6 +57,102 @@ def test_part_two():
     )
 
 
+@pytest.mark.parametrize("text", [b"1.*\n$45\n", b"1.*\n$45"])
+def test_grid_masks(text: bytes):
+    """Test that the schematic is viewed as bytes and classified."""
+    grid = day_03.as_grid(text)
+    assert grid.dtype == np.uint8 and grid.shape == (2, 3)
+    assert np.shares_memory(grid, np.frombuffer(text, dtype=np.uint8))
+    assert day_03.number_mask(grid).tolist() == [[1, 0, 0], [0, 1, 1]]
+    assert day_03.symbol_mask(grid).tolist() == [[0, 0, 1], [1, 0, 0]]
+    assert day_03.gear_mask(grid).tolist() == [[0, 0, 1], [0, 0, 0]]
+
+
+@pytest.mark.parametrize("text", ["1..\n*\n..5\n...", "1..\n*...\n..5", "\n1"])
+def test_ragged_grid(text: str):
+    """Test that rows of different widths are rejected."""
+    with pytest.raises(ValueError):
+        day_03.as_grid(text)
+
+
+def test_symbols_with_adjacent():
+    """Test querying symbols by the number of adjacent numbers."""
+    index = day_03.index_schematic(
+        day_03.as_grid(
+            b"""12.3
+.*#.
+4..5
+*6.."""
+        )
+    )
+    assert index.adjacent_counts().tolist() == [2, 3, 2]
+    assert index.with_adjacent(2).tolist() == [[12, 4], [4, 6]]
+    assert index.with_adjacent(2, b"*").tolist() == [[12, 4], [4, 6]]
+    assert index.with_adjacent(3).tolist() == [[12, 3, 5]]
+    assert index.with_adjacent(3, b"*").shape == (0, 3)
+    assert index.with_adjacent(0).shape == (0, 0)
+
+
+def test_symbols_without_adjacent():
+    """Test querying symbols that have no adjacent numbers."""
+    index = day_03.index_schematic(day_03.as_grid(b"*..#\n...1\n$..."))
+    assert index.adjacent_counts().tolist() == [0, 1, 0]
+    assert index.with_adjacent(0).shape == (2, 0)
+    assert index.with_adjacent(0, b"$").shape == (1, 0)
+
+
+def test_number_values():
+    """Test that number values are accumulated from their digits."""
+    grid = day_03.as_grid(b"1204..7\n.$..980")
+    labels, _ = label(day_03.number_mask(grid), structure=day_03.ROW)
+    assert day_03.number_values(grid, labels).tolist() == [0, 1204, 7, 980]
+    assert day_03.get_part_numbers(b"1204..7\n.$..980") == (1204,)
+
+
+def test_stream_schematic():
+    """Test that streaming the schematic gives the same parts and gears."""
+    lines = iter(SAMPLE.splitlines(keepends=True))
+    events = tuple(day_03.stream_schematic(lines))
+    assert sum(value for kind, value in events if kind == "part") == 4361
+    assert sum(value for kind, value in events if kind == "gear") == 467835
+    assert [kind for kind, _ in events].count("gear") == 2
+
+
+def test_stream_schematic_whitespace_symbols():
+    """Test that streaming treats whitespace as a symbol like the dense backend."""
+    events = tuple(
+        day_03.stream_schematic(iter(["1 2\n", "...\n", "4\t*\n", "..5\n"]))
+    )
+    assert events == (("part", 1), ("part", 2), ("part", 4), ("part", 5))
+    assert sorted(value for _, value in events) == sorted(
+        day_03.get_part_numbers("1 2\n...\n4\t*\n..5")
+    )
+
+
+@pytest.mark.parametrize("backend", ["dense", "sparse"])
+def test_backends(backend):
+    """Test that both backends find the same parts and gears."""
+    assert sum(day_03.get_part_numbers(SAMPLE, backend=backend)) == 4361
+    assert day_03.get_gear_ratios(SAMPLE, backend=backend) == (16345, 451490)
+    assert day_03.get_part_numbers(SAMPLE, backend=backend) == (
+        467,
+        35,
+        633,
+        617,
+        592,
+        755,
+        664,
+        598,
+    )
+
+
+@pytest.mark.parametrize("backend", ["dense", "sparse"])
+def test_backends_whitespace_symbols(backend):
+    """Test that both backends treat whitespace as a symbol."""
+    assert day_03.get_part_numbers("1 2\n...", backend=backend) == (1, 2)
+    assert day_03.get_part_numbers("1\t..\n...3", backend=backend) == (1,)
+
+
 if __name__ == "__main__":
     import pytest
     import sys
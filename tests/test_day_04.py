@@ -13,6 +13,15 @@ def test_part_one():
     assert (sum(day_04.scores(TEST).values())) == 13
 
 
+def test_match_counts():
+    """Test that matches are counted in a batch, ignoring repeated numbers."""
+    assert day_04.match_counts(TEST).tolist() == [4, 2, 2, 1, 0, 0]
+    assert day_04.match_counts("Card 1: 1 2 3 | 3 3 1\nCard 2: 5 | 5").tolist() == [
+        2,
+        1,
+    ]
+
+
 def test_part_two():
     """Test the counting method."""
     assert (
@@ -28,6 +37,29 @@ Card 6: 31 18 13 56 72 | 74 77 10 23 35 67 36 11"""
     )
 
 
+def test_part_two_long_chain():
+    """Test that long chains of copies are counted without recursion."""
+    cards = "\n".join(f"Card {i}: 1 2 | 1 5" for i in range(1, 3001))
+    assert day_04.num_cards(cards) == 3000 * 3001 // 2
+
+
+def test_part_two_billions_of_copies():
+    """Test that copies are counted rather than materialized."""
+    cards = "\n".join(f"Card {i}: 1 2 | 1 2" for i in range(1, 61))
+    fibonacci = [0, 1]
+    while len(fibonacci) < 65:
+        fibonacci.append(fibonacci[-1] + fibonacci[-2])
+    assert day_04.num_cards(cards) == fibonacci[64] - 3 - 60
+
+
+def test_stream_cards():
+    """Test that the running totals match both parts."""
+    totals = tuple(day_04.stream_cards(iter(TEST.splitlines(keepends=True))))
+    assert [total.card for total in totals] == [1, 2, 3, 4, 5, 6]
+    assert totals[-1] == (6, 13, 30)
+    assert [total.cards for total in totals] == [1, 3, 7, 15, 29, 30]
+
+
 if __name__ == "__main__":
     import pytest
     import sys
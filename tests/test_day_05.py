@@ -1,6 +1,7 @@
 """Tests for day 5."""
 from typing import Callable, Generator, Sequence
 from advent_of_code import day_05
+import numpy as np
 import pytest
 
 
@@ -76,6 +77,8 @@ def test_part_one(sample):
         ("after", (100, 1), ((100, 1),)),
         ("over", (8, 3), ((28, 2), (10, 1))),
         ("over multiple", (8, 5), ((28, 2), (10, 2), (17, 1))),
+        ("over start", (-2, 4), ((-2, 2), (20, 2))),
+        ("over end", (13, 3), ((18, 1), (14, 2))),
     ],
     ids=lambda val: (val,) if isinstance(val, str) else "",
 )
@@ -91,11 +94,196 @@ def test_range_converter(
     ), f"Expected the sample [{str(test)[1:-1]}) in '{location}' to return {result}."
 
 
+def test_compiled_layer():
+    """Test that a compiled layer maps arrays of values."""
+    layer = day_05.compile_layer(
+        [day_05.AlmanacRow(20, 0, 10), day_05.AlmanacRow(17, 12, 2)]
+    )
+    assert layer([-2, 0, 9, 10, 11, 12, 13, 14, 100]).tolist() == [
+        -2,
+        20,
+        29,
+        10,
+        11,
+        17,
+        18,
+        14,
+        100,
+    ]
+    assert day_05.compile_layer([])([1, 2]).tolist() == [1, 2]
+
+
+def test_trails(sample):
+    """Test that the full trail of each seed is recorded."""
+    paths, mappings = day_05.trails(sample)
+    assert paths[0] == "seed" and paths[-1] == "location"
+    assert mappings[79] == (79, 81, 81, 81, 74, 78, 78, 82)
+    assert mappings[14] == (14, 14, 53, 49, 42, 42, 43, 43)
+
+
+def test_composed_layers(sample):
+    """Test that composing the layers matches applying them one by one."""
+    _, paths, layers = day_05.compiled_almanac(sample)
+    values = np.arange(-5, 120)
+    expected = values
+    for name in paths[1:]:
+        expected = layers[name](expected)
+    composed = day_05.transform(sample, "seed", "location")
+    assert composed(values).tolist() == expected.tolist()
+    assert day_05.transform(sample, "seed", "location") is composed
+    assert day_05.transform(sample, "soil", "soil")(values).tolist() == list(values)
+    assert day_05.transform(sample, "seed", "soil")([79, 14, 55, 13]).tolist() == [
+        81,
+        14,
+        57,
+        13,
+    ]
+    with pytest.raises(ValueError):
+        day_05.transform(sample, "location", "seed")
+
+
+def test_interval_set():
+    """Test that interval sets are sorted and merged."""
+    ranges = day_05.IntervalSet.from_ranges([(10, 5), (0, 2), (2, 3), (12, 1), (20, 0)])
+    assert ranges.ranges() == ((0, 5), (10, 5))
+    assert day_05.IntervalSet.from_ranges([]).ranges() == ()
+
+
+def test_interval_set_map():
+    """Test that mapping an interval set merges the converted fragments."""
+    layer = day_05.compile_layer(
+        [day_05.AlmanacRow(20, 0, 10), day_05.AlmanacRow(17, 12, 2)]
+    )
+    ranges = day_05.IntervalSet.from_ranges([(8, 5), (100, 2), (102, 1)])
+    assert ranges.map(layer).ranges() == ((10, 2), (17, 1), (28, 2), (100, 3))
+
+
+def test_split_batch():
+    """Test that a batch of ranges is split into flat fragment arrays."""
+    layer = day_05.compile_layer(
+        [day_05.AlmanacRow(20, 0, 10), day_05.AlmanacRow(17, 12, 2)]
+    )
+    starts, lengths = layer.split([-5, 8, 11, 3], [10, 5, 0, 1])
+    assert starts.tolist() == [-5, 20, 28, 10, 17, 23]
+    assert lengths.tolist() == [5, 5, 2, 2, 1, 1]
+
+
+def test_ranged_trails(sample):
+    """Test that each layer of the ranged trails is normalized."""
+    trails = day_05.ranged_trails(sample)
+    assert trails["seed"] == ((55, 13), (79, 14))
+    for ranges in trails.values():
+        starts, lengths = np.asarray(ranges).T
+        assert (starts[1:] > starts[:-1] + lengths[:-1]).all()
+    assert sum(length for _, length in trails["location"]) == 27
+
+
+def test_iter_layer(sample):
+    """Test that seeds are mapped to one layer in chunks."""
+    chunks = list(day_05.iter_layer(sample, "soil", chunk_size=3))
+    assert [seeds.tolist() for seeds, _ in chunks] == [[79, 14, 55], [13]]
+    assert [values.tolist() for _, values in chunks] == [[81, 14, 57], [13]]
+
+
 def test_part_two(sample):
     """Test that part two works correctly based on the example given."""
     assert day_05.lowest_ranged_location(sample, "location") == 46
 
 
+@pytest.mark.parametrize("loc", ["soil", "light", "humidity", "location"])
+def test_inverse_search(sample, loc: str):
+    """Test that searching from the lowest locations matches the forward pass."""
+    assert day_05.lowest_location(sample, loc, inverse=True) == day_05.lowest_location(
+        sample, loc
+    )
+    assert day_05.lowest_ranged_location(
+        sample, loc, inverse=True
+    ) == day_05.lowest_ranged_location(sample, loc)
+
+
+def test_inverse_search_huge_ranges(sample):
+    """Test that the inverse search does not depend on the size of the seeds."""
+    almanac = "seeds: 50 9000000000" + sample[sample.index("\n") :]
+    assert day_05.lowest_ranged_location(almanac, "location", inverse=True) == (
+        day_05.lowest_ranged_location(almanac, "location")
+    )
+
+
+def test_mutable_almanac(sample):
+    """Test that editing rows of an almanac updates the queries."""
+    almanac = day_05.MutableAlmanac(sample)
+    assert almanac.lowest_location() == 35
+    assert almanac.lowest_ranged_location() == 46
+    soil = almanac.transform("seed", "soil")
+    location = almanac.transform("seed", "location")
+    almanac.insert("location", day_05.AlmanacRow(0, 30, 10))
+    assert almanac.transform("seed", "soil") is soil
+    assert almanac.transform("seed", "location") is not location
+    assert almanac.lowest_location() == 5
+    almanac.remove("location", day_05.AlmanacRow(0, 30, 10))
+    assert almanac.lowest_location() == 35
+    with pytest.raises(ValueError):
+        almanac.remove("location", day_05.AlmanacRow(0, 30, 10))
+    with pytest.raises(ValueError):
+        almanac.insert("soil", day_05.AlmanacRow(0, 97, 2))
+
+
+def test_cached_input(sample, tmp_path):
+    """Test that a parsed almanac is cached and memory-mapped by its hash."""
+    tmp_path = tmp_path / "cache"
+    seeds, paths, rows = day_05.read_arrays(sample)
+    for _ in range(2):
+        cached_seeds, cached_paths, cached_rows = day_05.read_arrays(
+            sample, cache_dir=tmp_path
+        )
+        assert isinstance(cached_rows, np.memmap)
+        assert cached_seeds.tolist() == seeds.tolist()
+        assert cached_paths == paths
+        assert cached_rows.tolist() == rows.tolist()
+    (cached,) = tmp_path.iterdir()
+    assert sorted(path.name for path in cached.iterdir()) == [
+        "paths.txt",
+        "rows.npy",
+        "seeds.npy",
+    ]
+
+
+@pytest.mark.parametrize("cache_dir", ["/proc/nope", "file"])
+def test_unusable_cache(sample, tmp_path, cache_dir):
+    """Test that a cache that cannot be written falls back to parsing."""
+    (tmp_path / "file").write_text("")
+    seeds, paths, rows = day_05.read_arrays(sample, tmp_path / cache_dir)
+    assert seeds.tolist() == [79, 14, 55, 13]
+    assert rows.tolist() == day_05.read_arrays(sample)[2].tolist()
+
+
+def test_corrupt_cache(sample, tmp_path):
+    """Test that a cache that cannot be read falls back to parsing."""
+    day_05.read_arrays(sample, tmp_path)
+    (cached,) = tmp_path.iterdir()
+    (cached / "rows.npy").write_bytes(b"")
+    assert day_05.lowest_location(sample, "location", cache_dir=tmp_path) == 35
+
+
+def test_cached_solvers(sample, tmp_path):
+    """Test that the solvers give the same results from the cache."""
+    assert day_05.trails(sample, tmp_path) == day_05.trails(sample)
+    assert day_05.ranged_trails(sample, tmp_path) == day_05.ranged_trails(sample)
+    for inverse in (False, True):
+        assert (
+            day_05.lowest_location(sample, "location", inverse, cache_dir=tmp_path)
+            == 35
+        )
+        assert (
+            day_05.lowest_ranged_location(
+                sample, "location", inverse, cache_dir=tmp_path
+            )
+            == 46
+        )
+    assert day_05.MutableAlmanac(sample, tmp_path).lowest_location() == 35
+    assert len(list(tmp_path.iterdir())) == 1
+
+
 if __name__ == "__main__":
     import sys
 
@@ -1,4 +1,5 @@
 from advent_of_code import day_06
+import numpy as np
 import pytest
 
 
@@ -54,10 +55,100 @@ def test_margin_of_error_from_input(sample):
     assert day_06.margin_of_error(*day_06.parse_input_to_race_combos(sample)) == 288
 
 
+def test_margin_of_error_from_counts(sample):
+    assert day_06.margin_of_error(*day_06.race_combo_counts(sample)) == 288
+    assert day_06.margin_of_error(4, day_06.second_race_combos(), 9) == 288
+    assert (
+        day_06.margin_of_error(
+            *day_06.batch_race_combo_counts([7, 15, 30], [9, 40, 200])
+        )
+        == 288
+    )
+
+
 def test_margin_of_error_from_input_with_kerning_fixed(sample):
     assert day_06.margin_of_error_optimized(sample) == 71503
 
 
+@pytest.mark.parametrize(
+    ("duration", "record"),
+    [
+        (7, 9),
+        (15, 40),
+        (30, 200),
+        (0, 0),
+        (1, 0),
+        (2, 0),
+        (4, 4),
+        (5, 6),
+        (9, -1),
+        (-3, 0),
+        (-3, -5),
+    ],
+)
+def test_winning_bounds_match_scan(duration: int, record: int):
+    """Test that the closed-form solver matches scanning every hold time."""
+    expected = tuple(
+        held for held in range(duration) if day_06.race(held, duration) > record
+    )
+    assert day_06.race_combos(race_duration=duration, record_distance=record) == (
+        expected
+    )
+    assert day_06.race_combo_count(
+        race_duration=duration, record_distance=record
+    ) == len(expected)
+
+
+def test_winning_bounds_huge():
+    """Test that the bounds are exact for very large races."""
+    duration = 10**40 + 7
+    record = duration**2 // 4 - 10**30
+    first, last = day_06.winning_bounds(race_duration=duration, record_distance=record)
+    assert day_06.race(first, duration) > record >= day_06.race(first - 1, duration)
+    assert day_06.race(last, duration) > record >= day_06.race(last + 1, duration)
+
+
+def test_race_combo_counts(sample):
+    assert day_06.race_combo_counts(sample) == (4, 8, 9)
+
+
+def test_batch_race_combo_counts():
+    """Test that the vectorized counts match the exact solver."""
+    rng = np.random.default_rng(6)
+    times = rng.integers(0, 2**31, size=2000)
+    distances = (times // 2) * (times - times // 2) - rng.integers(-5, 10**6, 2000)
+    distances = np.maximum(distances, 0)
+    times[:3], distances[:3] = (7, 15, 30), (9, 40, 200)
+    counts = day_06.batch_race_combo_counts(times, distances)
+    assert counts.dtype == np.int64
+    assert counts.tolist() == [
+        day_06.race_combo_count(race_duration=int(t), record_distance=int(d))
+        for t, d in zip(times, distances)
+    ]
+    assert day_06.batch_margin_of_error(times[:3], distances[:3]) == 288
+
+
+def test_batch_race_combo_counts_negative():
+    """Test that negative times and records match the exact solver."""
+    times = [-3, -(2**70), 0, 5, 5, 2**40]
+    distances = [0, 0, -1, -1, -(2**70), 2**61]
+    assert day_06.batch_race_combo_counts(times, distances).tolist() == [
+        day_06.race_combo_count(race_duration=t, record_distance=d)
+        for t, d in zip(times, distances)
+    ]
+
+
+def test_batch_race_combo_counts_overflow():
+    """Test that races too large for int64 fall back to exact integers."""
+    times = [7, 2**40, 10**30]
+    distances = [9, 2**70, 10**59]
+    counts = day_06.batch_race_combo_counts(times, distances)
+    assert counts.tolist() == [
+        day_06.race_combo_count(race_duration=t, record_distance=d)
+        for t, d in zip(times, distances)
+    ]
+
+
 if __name__ == "__main__":
     import sys
 
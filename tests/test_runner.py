@@ -0,0 +1,66 @@
+import json
+
+from advent_of_code import runner
+import pytest
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    """Fixture with a directory containing the inputs of days 2 and 6."""
+    (tmp_path / "day_02.txt").write_text(
+        """Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green
+Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue
+Game 3: 8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green; 5 green, 1 red
+Game 4: 1 green, 3 red, 6 blue; 3 green, 6 red; 3 green, 15 blue, 14 red
+Game 5: 6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green"""
+    )
+    (tmp_path / "day_06.txt").write_text(
+        """Time:      7  15   30
+Distance:  9  40  200"""
+    )
+    return tmp_path
+
+
+def test_discover_days():
+    assert runner.discover_days() == (1, 2, 3, 4, 5, 6)
+
+
+def test_run_part(inputs):
+    default = runner.utils.INPUTS
+    report = runner.run_part(6, 2, str(inputs))
+    assert (report.day, report.part, report.result, report.error) == (6, 2, 71503, None)
+    assert report.wall_time >= 0 and report.cpu_time >= 0 and report.peak_memory > 0
+    assert runner.utils.INPUTS == default
+
+
+def test_run_part_missing_input(tmp_path):
+    report = runner.run_part(1, 1, str(tmp_path))
+    assert report.result is None and report.error.startswith("FileNotFoundError")
+
+
+def test_main_json(inputs, capsys):
+    assert runner.main(["2", "6", "--inputs", str(inputs), "--json"]) == 0
+    output = json.loads(capsys.readouterr().out)
+    assert [
+        (part["day"], part["part"], part["result"]) for part in output["parts"]
+    ] == [(2, 1, 8), (2, 2, 2286), (6, 1, 288), (6, 2, 71503)]
+
+
+def test_main_table(inputs, capsys):
+    assert runner.main(["6", "1", "--parts", "1", "--inputs", str(inputs)]) == 1
+    header, day_six, day_one, total = capsys.readouterr().out.splitlines()
+    assert header.split()[:3] == ["Day", "Part", "Result"]
+    assert day_six.split()[:3] == ["06", "1", "288"]
+    assert "FileNotFoundError" in day_one
+    assert total.startswith("Total wall time")
+
+
+def test_main_unknown_day():
+    with pytest.raises(SystemExit):
+        runner.main(["99"])
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(pytest.main([__file__] + ["-vv", "-s"]))
@@ -0,0 +1,124 @@
+import glob
+import os
+import subprocess
+import sys
+import types
+
+import advent_of_code
+from advent_of_code import utils
+import pytest
+
+DAYS = tuple(
+    f"advent_of_code.{os.path.basename(path)[:-3]}"
+    for path in sorted(
+        glob.glob(os.path.join(os.path.dirname(advent_of_code.__file__), "day_*.py"))
+    )
+)
+
+
+@pytest.fixture
+def inputs(tmp_path, monkeypatch):
+    """Fixture with a temporary inputs directory containing day 1."""
+    monkeypatch.setattr(utils, "INPUTS", str(tmp_path))
+    (tmp_path / "day_01.txt").write_text("1abc2\npqr3stu8vwx\n")
+    return tmp_path
+
+
+def test_input_path(inputs, tmp_path_factory):
+    assert utils.input_path(1) == str(inputs / "day_01.txt")
+    other = tmp_path_factory.mktemp("other")
+    assert utils.input_path(1, other) == str(other / "day_01.txt")
+    assert utils.cache_path(5, other) == str(other / ".cache" / "day_05")
+
+
+@pytest.mark.parametrize(
+    ("mode", "expected"),
+    [
+        ("text", "1abc2\npqr3stu8vwx\n"),
+        ("bytes", b"1abc2\npqr3stu8vwx\n"),
+    ],
+)
+def test_load(inputs, mode, expected):
+    with utils.load(1, mode) as contents:
+        assert contents == expected
+
+
+def test_load_mmap(inputs):
+    with utils.load(1, "mmap") as contents:
+        assert contents[:5] == b"1abc2"
+        assert contents.find(b"\n") == 5
+
+
+def test_load_lines(inputs):
+    with utils.load(1, "lines") as lines:
+        assert next(lines) == "1abc2\n"
+        assert list(lines) == ["pqr3stu8vwx\n"]
+
+
+def test_load_from_inputs(tmp_path):
+    (tmp_path / "day_02.txt").write_text("Game 1: 1 red")
+    with utils.load(2, inputs=tmp_path) as contents:
+        assert contents == "Game 1: 1 red"
+
+
+def test_load_unknown_mode(inputs):
+    with pytest.raises(ValueError):
+        with utils.load(1, "json"):
+            ...
+
+
+def test_lazy_import():
+    module = utils.lazy_import("json.decoder")
+    assert module.JSONDecoder().decode("[1]") == [1]
+    assert utils.lazy_import("sys") is sys
+
+
+def test_import_lazy_modules():
+    module = types.ModuleType("example")
+    module.tool = utils.LazyModule("json.tool")
+    utils.import_lazy_modules(module)
+    assert "main" in vars(module.tool)
+
+
+@pytest.mark.parametrize("module", ["advent_of_code", *DAYS])
+def test_import_is_lazy(module: str):
+    """Test that importing a day neither loads numpy/scipy nor finds the version."""
+    loaded = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys, advent_of_code, {module}; "
+            "print(*(m for m in ('numpy', 'scipy') if m in sys.modules), "
+            "'__version__' in vars(advent_of_code))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert loaded.stdout.split() == ["False"]
+
+
+def _import_time(*modules: str) -> int:
+    """Get the cumulative time, in microseconds, to import top-level modules."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    return sum(
+        int(line.split("|")[1])
+        for line in stderr.splitlines()
+        if line.split("|")[-1].strip() in modules
+    )
+
+
+def test_import_time():
+    """Test that importing every day is cheaper than importing numpy alone."""
+    assert _import_time(*DAYS) < _import_time("numpy")
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(pytest.main([__file__] + ["-vv", "-s"]))